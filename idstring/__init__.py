@@ -1,3 +1,4 @@
 from .idstring import DEFAULT_ALPHABET, DEFAULT_CASE_SHIFT, DEFAULT_DIRTY_WORDS, DIRTY_I_WORDS, IDstring, \
-    IdStringError, InvalidIdError, OutOfRangeError, noshift, __version__
+    IdStringError, InvalidIdError, OutOfRangeError, AuditReport, HashClassifier, IdFields, audit_ids, noshift, \
+    parse_ids, register_config, __version__
 
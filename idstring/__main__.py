@@ -0,0 +1,193 @@
+""" command line interface for the idstring package
+
+    python -m idstring generate --seed 1Y3R9C --host 01 --count 100000 --format csv --output ids.csv
+
+The --seed (or the content of --seed-file) is the seed of the LAST value issued, as a seedstore would
+have saved it, so the run begins with the next value in the series.
+IDs are streamed from a generator and written in large chunks, so the whole run is never held in memory.
+The final seed is preserved exactly once, after the last ID has been written, using --seed-file and/or
+a --seedstore function of your own (written as "module:function") which is called with the final IDstring.
+If the run is cut short (a broken pipe, a full disk...) the seed of the last ID generated is still preserved,
+so a later run may leave a gap in the series, but will never repeat an ID.
+"""
+import argparse
+import csv
+import importlib
+import io
+import json
+import os
+import sys
+from itertools import islice
+
+from .idstring import DEFAULT_CASE_SHIFT, IDstring, IdStringError
+
+BUFFER_SIZE = 1 << 20  # bytes of output file buffering
+BATCH_SIZE = 10000  # number of IDs formatted into each write() call
+
+
+class _Series:
+    """an iterator over the IDstrings which follow `start`. .last is the last one it has produced"""
+    def __init__(self, start, count):
+        self.last = None
+        self._idstr = IDstring(str(start), host=start.host, hash=start.hash, alphabet=start.alphabet,
+                               case_shift=start.case_shift, no_check=True)
+        self._remaining = count
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._remaining <= 0:
+            raise StopIteration
+        self._remaining -= 1
+        self._idstr += 1
+        self.last = self._idstr
+        return self.last
+
+
+def generate(start, count):
+    """returns an iterator over the `count` IDstrings which follow `start` in its series.
+    Its .last attribute is the last IDstring produced so far (None before the first).
+
+    the seedstore of `start` is NOT called for each value. The caller should preserve the last one.
+    """
+    return _Series(start, count)
+
+
+def _text_chunk(batch):
+    return ''.join([f'{idstr}\n' for idstr in batch])
+
+
+def _csv_chunk(batch):
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator='\n').writerows([(idstr, idstr.seed) for idstr in batch])
+    return buf.getvalue()
+
+
+def _jsonl_chunk(batch):
+    dumps = json.dumps
+    return ''.join([dumps({'id': str(idstr), 'seed': idstr.seed}) + '\n' for idstr in batch])
+
+
+FORMATS = {'text': _text_chunk, 'csv': _csv_chunk, 'jsonl': _jsonl_chunk}
+
+
+def write_ids(out, ids, format='text', batch_size=BATCH_SIZE):
+    """write a stream of IDstrings to the text file `out`, one large write() per batch
+
+    returns the last IDstring written, or None if `ids` was empty
+    """
+    to_chunk = FORMATS[format]
+    if format == 'csv':
+        out.write('id,seed\n')
+    last = None
+    ids = iter(ids)
+    while True:
+        batch = list(islice(ids, batch_size))
+        if not batch:
+            return last
+        out.write(to_chunk(batch))
+        last = batch[-1]
+
+
+def load_seedstore(spec):
+    """import a seedstore function given as "module:function" """
+    module_name, _, func_name = spec.partition(':')
+    if not func_name:
+        raise IdStringError(f'seedstore "{spec}" must be written as "module:function"')
+    try:
+        seedstore = getattr(importlib.import_module(module_name), func_name)
+    except (ImportError, AttributeError) as e:
+        raise IdStringError(f'cannot load seedstore "{spec}": {e}') from None
+    if not callable(seedstore):
+        raise IdStringError(f'seedstore "{spec}" is not Callable')
+    return seedstore
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m idstring', description=__doc__.split('\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    gen = commands.add_parser('generate', help='write a run of serial numbers')
+    gen.add_argument('--seed', help='seed of the last value issued (default: read from --seed-file)')
+    gen.add_argument('--seed-file', help='file holding the seed. It is rewritten with the final seed.')
+    gen.add_argument('--seedstore', help='"module:function" to be called once with the final IDstring')
+    gen.add_argument('--host', default='', help='the fixed host field')
+    gen.add_argument('--hash', default='', help='string which alters the check digit for this project')
+    gen.add_argument('--no-checksum', action='store_true', help='do not append a check digit (hash=None)')
+    gen.add_argument('--alphabet', default=None, help='alternate alphabet')
+    gen.add_argument('--count', type=int, required=True, help='how many IDs to generate')
+    gen.add_argument('--format', choices=sorted(FORMATS), default='text', help='output format')
+    gen.add_argument('--output', default='-', help='output file name, or "-" for stdout (the default)')
+    args = parser.parse_args(argv)
+    if args.seed is None:
+        if args.seed_file is None:
+            parser.error('one of --seed or --seed-file is required')
+        try:
+            with open(args.seed_file) as f:
+                args.seed = f.read().strip()
+        except OSError as e:
+            parser.error(f'cannot read seed file: {e}')
+    if args.count < 0:
+        parser.error('--count must not be negative')
+    if not args.seed:
+        parser.error('the seed must not be empty')
+    alphabet = args.alphabet or IDstring.ALPHABET
+    for name in ('seed', 'host'):
+        value = DEFAULT_CASE_SHIFT(getattr(args, name))
+        bad = ''.join(sorted(set(value) - set(alphabet)))
+        if bad:
+            parser.error(f'--{name} "{value}" has characters "{bad}" which are not in the alphabet')
+    try:
+        args.seedstore = load_seedstore(args.seedstore) if args.seedstore else None
+    except IdStringError as e:
+        parser.error(str(e))
+    if args.output == '-':
+        args.output = sys.stdout
+    else:
+        try:
+            args.output = open(args.output, 'w', buffering=BUFFER_SIZE, newline='')
+        except OSError as e:
+            parser.error(f'cannot open output file: {e}')
+    return args
+
+
+def _save_seed(args, last):
+    """preserve the seed of the last IDstring generated"""
+    if args.seed_file:
+        with open(args.seed_file, 'w') as f:
+            f.write(last.get_seed() + '\n')
+    if args.seedstore:
+        args.seedstore(last)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    start = IDstring(seed=args.seed, host=args.host, hash=None if args.no_checksum else args.hash,
+                     alphabet=args.alphabet)
+    ids = generate(start, args.count)
+    out = args.output
+    try:
+        write_ids(out, ids, args.format)
+        out.flush()
+    except BrokenPipeError:  # e.g. piped into "head". Quietly stop.
+        try:  # keep Python from complaining again when it flushes stdout at exit
+            os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+        except (AttributeError, OSError, ValueError):
+            pass
+        return 1
+    except OSError as e:
+        print(f'python -m idstring: error: cannot write output: {e}', file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            try:
+                out.close()
+            except OSError:
+                pass
+        if ids.last is not None:  # preserve the seed, once, even if the run was cut short
+            _save_seed(args, ids.last)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -25,7 +25,12 @@ The string is initialized using a five-argument call like; idstring.IDstring(IDs
 #  following URL:
 #   http://www.gnu.org/copyleft/lgpl.html
 #
+import copy
+import pickle
+import re
+from collections import defaultdict, namedtuple
 from collections.abc import Callable
+from functools import partial
 
 __author__ = "Vernon Cole <vernondcole@gmail.com>"
 __version__ = "2.1.4"
@@ -87,6 +92,32 @@ DIRTY_I_WORDS = [c[::-1] for c in ['TIHS', 'TIT', 'SSIP']]  # if your alternate
 # the dirty word test is case independent.
 
 
+# named configurations, so that seedstore and context (which usually cannot be pickled)
+# can be re-bound when an IDstring is unpickled in another process. See register_config()
+_config_registry = {}
+
+
+def register_config(name, host='', hash='', alphabet=None, case_shift=DEFAULT_CASE_SHIFT,
+                    seedstore=None, context=None):
+    """
+    define a named configuration for IDstrings.
+    An IDstring made with IDstring.from_config(name, ...) pickles as just its string value and the name.
+    Every process which unpickles such IDstrings must register the same name,
+    supplying its own (local) seedstore and context.
+    """
+    if seedstore is not None and not isinstance(seedstore, Callable):
+        raise IdStringError('seedstore "%s" is not Callable' % repr(seedstore))
+    _config_registry[name] = dict(host=host, hash=hash, alphabet=alphabet, case_shift=case_shift,
+                                  seedstore=seedstore, context={} if context is None else context)
+
+
+def _lookup_config(name):
+    try:
+        return _config_registry[name]
+    except KeyError:
+        raise IdStringError(f'IDstring configuration "{name}" has not been registered') from None
+
+
 class IDstring(str):
     """
     Returns a complex string-value object which has an _add_ method for plus 1.
@@ -124,7 +155,7 @@ class IDstring(str):
 
     @staticmethod
     def __new__(cls, idstr=None, seed=None, host='', seedstore=None, hash='', alphabet=None,
-                case_shift=DEFAULT_CASE_SHIFT, no_check=False, context={}):
+                case_shift=DEFAULT_CASE_SHIFT, no_check=False, context={}, config=None):
         """
         :S - an existing legal idString, or None
         :seed - the seed string for a new factory [ignored unless S is None]
@@ -134,6 +165,7 @@ class IDstring(str):
         :hash - an additional string to alter the calculation of the check digit for diverse projects
                 pass hash=None to turn off checksum testing and creation. Makes this module dumb.
         :case_shift - function to apply to input strings. one of str.upper str.lower or None
+        :config - name of a registered configuration, used when pickling. (see IDstring.from_config)
         """
         if case_shift is None:
             case_shift = noshift
@@ -157,6 +189,7 @@ class IDstring(str):
             seedstore = idstr.seedstore
             case_shift = idstr.case_shift
             context = idstr.context
+            config = idstr.config
         elif isinstance(idstr, str):
             us = case_shift(idstr)  # if passing a string as on IDstring, it must already have a checksum
             if no_check:
@@ -184,6 +217,53 @@ class IDstring(str):
         new.seedstore = seedstore
         new.context = context
         new.case_shift = case_shift
+        new.config = config
+        return new
+
+
+    @classmethod
+    def from_config(cls, name, idstr=None, seed=None, no_check=False):
+        """create an IDstring using the settings of a configuration defined by register_config(name, ...)"""
+        return cls(idstr, seed, no_check=no_check, config=name, **_lookup_config(name))
+
+
+    def __reduce__(self):
+        """pickle as the string value plus a reference to one shared restore function per configuration,
+        so that, after the first one, each IDstring costs little more than a plain str.
+        If .config is defined, seedstore and context are not pickled. They are re-bound from the registry.
+        Otherwise, an IDstring with a seedstore or context is pickled with all of its attributes (the slow way)
+        and IdStringError is raised if they cannot be pickled.
+        """
+        if self.config is not None:
+            config = self.config
+        elif self.seedstore is not None or self.context:
+            try:
+                pickle.dumps((self.seedstore, self.context))
+            except Exception as e:
+                raise IdStringError(f'Cannot pickle the seedstore or context of IDstring "{self}" ({e}). '
+                                    'Use register_config() and IDstring.from_config() to have them re-bound.') from e
+            return _restore_state, (type(self), str(self), self.__dict__)
+        else:
+            config = (self.host, self.hash, self.alphabet, self.case_shift)
+        key = (type(self), config)
+        try:
+            restore = _restorers[key]
+        except KeyError:
+            restore = _restorers[key] = partial(_restore, type(self), config)
+        return restore, (str(self),)
+
+
+    def __copy__(self):
+        new = str.__new__(type(self), str(self))
+        new.__dict__.update(self.__dict__)
+        return new
+
+
+    def __deepcopy__(self, memo):
+        """the copy shares the seedstore, but gets its own copy of the context"""
+        new = self.__copy__()
+        memo[id(self)] = new
+        new.context = copy.deepcopy(self.context, memo)
         return new
 
 
@@ -268,7 +348,8 @@ class IDstring(str):
             next_thing = self._run_factory()
             # Python strings are immutable, so we must create a new instance
             ret = IDstring(next_thing, host=self.host, seedstore=self.seedstore, hash=self.hash,
-                           case_shift=self.case_shift, alphabet=self.alphabet, no_check=True, context=self.context)
+                           case_shift=self.case_shift, alphabet=self.alphabet, no_check=True, context=self.context,
+                           config=self.config)
             if ret.seedstore:    # call the seedstore function supplied by the program, with "self" as an argument
                 correction = ret.seedstore(ret)
                 if correction:  # user can return a new, improved ID value
@@ -297,6 +378,240 @@ class IDstring(str):
         return _sumcheck(s, hash, alphabet, case_shift)
 
 
+# one restore function for each (class, configuration), so that pickle sends it only once
+_restorers = {}
+
+
+def _restore(cls, config, value):
+    """unpickle an IDstring. config is a registered configuration name, or a tuple of settings"""
+    if isinstance(config, str):
+        return cls.from_config(config, value, no_check=True)
+    host, hash, alphabet, case_shift = config
+    return cls(value, host=host, hash=hash, alphabet=alphabet, case_shift=case_shift, no_check=True)
+
+
+def _restore_state(cls, value, state):
+    """unpickle an IDstring which was pickled with all of its attributes"""
+    new = str.__new__(cls, value)
+    new.__dict__.update(state)
+    return new
+
+
+IdFields = namedtuple('IdFields', 'seed host check by_host')
+IdFields.__doc__ = """columns of the fields of many IDstrings, as returned by parse_ids()
+:seed - list of seed values (str, or int if requested)
+:host - list of host fields
+:check - list of check digits ('' if checksums are disabled)
+:by_host - dictionary of {host: [row numbers]}, rows in input order
+"""
+
+_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def _seed_to_int_function(alphabet):
+    """returns a function which converts a seed string into its positional integer value in the alphabet.
+    leading "zeros" (alphabet[0]) do not change the value.
+    """
+    n = len(alphabet)
+    if n <= len(_DIGITS):  # let int() do the work
+        table = str.maketrans(alphabet, _DIGITS[:n])
+        return lambda seed: int(seed.translate(table), n)
+    code_points = {c: i for i, c in enumerate(alphabet)}
+    def seed_to_int(seed):
+        value = 0
+        for c in seed:
+            value = value * n + code_points[c]
+        return value
+    return seed_to_int
+
+
+def _config_settings(config):
+    """returns (host, hash, alphabet, case_shift) for an IDstring example, or a registered configuration name"""
+    if isinstance(config, str) and not isinstance(config, IDstring):
+        settings = _lookup_config(config)
+        return (settings['host'], settings['hash'], settings['alphabet'] or IDstring.ALPHABET,
+                settings['case_shift'] or noshift)
+    return config.host, config.hash, config.alphabet, config.case_shift
+
+
+def parse_ids(ids, config, as_int=False):
+    """
+    split many ID strings into their seed, host and check digit fields, without creating IDstring objects.
+    :ids - an iterable (or array) of ID strings, all made using the same configuration
+    :config - an example IDstring of that configuration, or the name of a registered configuration
+    :as_int - if True, the seed column will contain the integer value of each seed (in its alphabet)
+    returns an IdFields named tuple of columns, plus an index of row numbers grouped by host.
+    No checksums are tested. Use IDstring.sumcheck() for that.
+    """
+    host, hash, alphabet, case_shift = _config_settings(config)
+    host_len = len(host or '')
+    checksum_size = 0 if hash is None else 1
+    tail = host_len + checksum_size
+    rows = [case_shift(str(s)) for s in ids]
+    if rows and min(map(len, rows)) <= tail:
+        short = next(s for s in rows if len(s) <= tail)
+        raise InvalidIdError(f'ID "{short}" is too short to contain a seed')
+    if tail:
+        seeds = [s[:-tail] for s in rows]
+        hosts = [s[-tail:len(s) - checksum_size] for s in rows]
+    else:
+        seeds = rows
+        hosts = [''] * len(rows)
+    checks = [s[-1] for s in rows] if checksum_size else [''] * len(rows)
+    if as_int:
+        bad = set(''.join(seeds)) - set(alphabet)
+        if bad:
+            raise InvalidIdError(f'Incorrect character(s) {"".join(sorted(bad))} in seeds')
+        seeds = list(map(_seed_to_int_function(alphabet), seeds))
+    by_host = defaultdict(list)
+    for i, h in enumerate(hosts):
+        by_host[h].append(i)
+    return IdFields(seeds, hosts, checks, dict(by_host))
+
+
+class HashClassifier:
+    """
+    finds which of many hash values (i.e. which projects) an ID could have been issued under.
+
+    The Luhn mod N sum is additive, so the sum of the ID itself is calculated only once, and compared with
+    a precomputed table of the contribution made by each hash. Check digits have only len(alphabet) values,
+    so more than one project may match.
+    :hashes - a dictionary of {project_name: hash}, or a list of hashes (which will be their own names)
+    :alphabet - the alphabet shared by all the projects
+    :case_shift - function to apply to input strings. One of str.upper, str.lower, or None
+    """
+    def __init__(self, hashes, alphabet=None, case_shift=DEFAULT_CASE_SHIFT):
+        if not hasattr(hashes, 'items'):
+            hashes = {h: h for h in hashes}
+        self.alphabet = alphabet = alphabet or IDstring.ALPHABET
+        self.case_shift = case_shift = case_shift or noshift
+        self.hashes = dict(hashes)
+        n = len(alphabet)
+        # the sum-of-digits addend for each character when multiplied by each factor
+        self._addend = {factor: {c: (factor * i // n) + (factor * i % n) for i, c in enumerate(alphabet)}
+                        for factor in (1, 2)}
+        self._order = {}
+        self._table = defaultdict(list)  # {(len(hash) is odd, sum needed from the hash): [names]}
+        for name, hash in self.hashes.items():
+            if hash is None:
+                raise IdStringError(f'Project "{name}" does not use checksums (hash=None)')
+            hash = case_shift(str(hash))
+            offset = 0
+            factor = 2  # the hash is placed just left of the check digit
+            for c in hash[::-1]:
+                addend = factor * alphabet.find(c)  # as in _sumcheck, characters outside the alphabet count -1
+                offset += (addend // n) + (addend % n)
+                factor = 1 if factor == 2 else 2
+            self._order[name] = len(self._order)
+            self._table[(len(hash) % 2, offset % n)].append(name)
+
+    def classify(self, idstr):
+        """returns a list of the names of all projects whose hash gives idstr a valid check digit"""
+        s = self.case_shift(str(idstr))
+        n = len(self.alphabet)
+        once, twice = self._addend[1], self._addend[2]
+        try:
+            check = once[s[-1]]
+            body = s[-2::-1]  # right to left, without the check digit
+            # sum the body both ways: with its right-most digit doubled (even length hash) or not (odd)
+            even = sum(map(twice.__getitem__, body[0::2])) + sum(map(once.__getitem__, body[1::2])) + check
+            odd = sum(map(once.__getitem__, body[0::2])) + sum(map(twice.__getitem__, body[1::2])) + check
+        except (KeyError, IndexError):  # empty, or a character outside the alphabet
+            return []
+        found = self._table.get((0, -even % n), []) + self._table.get((1, -odd % n), [])
+        if len(found) > 1:
+            found.sort(key=self._order.__getitem__)
+        return found
+
+    def classify_many(self, ids):
+        """returns a list of classify() results, one for each ID"""
+        classify = self.classify
+        return [classify(idstr) for idstr in ids]
+
+
+def _int_to_seed(value, alphabet, width=1):
+    """the inverse of _seed_to_int_function(alphabet), padded with alphabet[0] to at least `width` digits"""
+    n = len(alphabet)
+    digits = []
+    while value:
+        value, i = divmod(value, n)
+        digits.append(alphabet[i])
+    return alphabet[0] * (width - len(digits)) + ''.join(reversed(digits))
+
+
+AuditReport = namedtuple('AuditReport', 'count duplicates missing out_of_series')
+AuditReport.__doc__ = """the result of audit_ids()
+:count - the number of IDs read
+:duplicates - list of IDs seen more than once (listed once for each repeat)
+:missing - list of IDs in the series which were not seen, in order
+:out_of_series - list of IDs which could not have been issued by the series
+"""
+
+
+def audit_ids(ids, first, last):
+    """
+    check a stream of issued IDs against the series which runs from `first` to `last` (inclusive)
+    in a single pass. Each ID is mapped to its place in the series, which is marked in a bitmap,
+    so memory use is one bit per value in the series.
+    :ids - an iterable of ID strings
+    :first - the IDstring of the first value issued. Its host, hash, alphabet etc. define the series.
+    :last - the last value issued (an IDstring, or an ID string of the same configuration)
+    returns an AuditReport.
+    Values containing one of the DIRTY_WORDS are treated as skipped by the series, so they are never reported
+    missing, and are out-of-series if they are seen. Wrong checksums, hosts or seed lengths are also out-of-series.
+    Only checksummed series can be audited: with hash=None the factory does not skip dirty words
+    correctly (it issues e.g. "ASS1"), so IdStringError is raised.
+    (a series which carries into a longer seed is only understood if alphabet[0] is "0")
+    """
+    host, hash, alphabet, case_shift = first.host, first.hash, first.alphabet, first.case_shift
+    if hash is None:
+        raise IdStringError('Cannot audit a series with no checksum (hash=None)')
+    width = len(first.get_seed())
+    if not isinstance(last, IDstring):
+        last = IDstring(last, host=host, hash=hash, alphabet=alphabet, case_shift=case_shift)
+    to_int = _seed_to_int_function(alphabet)
+    base = to_int(first.get_seed())
+    end = to_int(last.get_seed()) - base
+    if end < 0:
+        raise OutOfRangeError(f'last ID "{last}" comes before first ID "{first}"')
+    dirty_words = first.DIRTY_WORDS
+    tail = len(host) + 1  # the host field and the check digit
+    valid = HashClassifier([hash], alphabet, case_shift).classify
+    zero = alphabet[0]
+    bitmap = bytearray((end >> 3) + 1)
+    count = 0
+    duplicates = []
+    out_of_series = []
+    for idstr in ids:
+        count += 1
+        s = case_shift(str(idstr))
+        seed = s[:len(s) - tail]
+        if (len(seed) < width or len(seed) > width and seed[0] == zero
+                or s[len(seed):-1] != host or not valid(s)):
+            out_of_series.append(s)
+            continue
+        k = to_int(seed) - base
+        upped = s.upper()
+        if not 0 <= k <= end or any(word in upped for word in dirty_words):
+            out_of_series.append(s)
+            continue
+        byte, bit = k >> 3, 1 << (k & 7)
+        if bitmap[byte] & bit:
+            duplicates.append(s)
+        else:
+            bitmap[byte] |= bit
+    missing = []
+    for match in re.finditer(rb'[^\xff]', bitmap):  # only look closely at bytes with a bit not set
+        byte = match.start()
+        for k in range(byte << 3, min((byte << 3) + 8, end + 1)):
+            if not bitmap[byte] & (1 << (k & 7)):
+                value = _checksum(_int_to_seed(base + k, alphabet, width) + host, hash, alphabet)
+                upped = value.upper()
+                if not any(word in upped for word in dirty_words):
+                    missing.append(value)
+    return AuditReport(count, duplicates, missing, out_of_series)
+
+
 # checksum calulations ...
 # calculate a check digit using an arbitrary ALPHABET
 # using
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test code for the idstring command line interface
+"""
+import sys, os
+mommy = os.path.normpath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(1, mommy)  # use the local copy, not some system version
+
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+import idstring
+from idstring import __main__ as cli
+from idstring.idstring import IDstring
+
+stored = []  # seedstore calls are recorded here
+RECORDER = f'{__name__}:recorder'  # as passed to --seedstore
+
+def recorder(idstr):
+    stored.append(idstr.get_seed())
+
+
+class TestGenerate(unittest.TestCase):
+    def test_generate_skips_dirty_words(self):
+        start = IDstring(seed='dcasr', seedstore=recorder)
+        stored.clear()
+        self.assertEqual(list(cli.generate(start, 2)), ['DCASTR', 'DCASUN'])
+        self.assertEqual(stored, [], 'generate() must not call the seedstore')
+
+    def test_text_stdout(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            cli.main(['generate', '--seed', '1Y3R9C', '--count', '3'])
+        self.assertEqual(out.getvalue(), '1Y3R9D9\n1Y3R9E7\n1Y3R9F5\n')
+
+    def test_formats_and_seed_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            seed_file = os.path.join(tmp, 'seed.txt')
+            with open(seed_file, 'w') as f:
+                f.write('0\n')
+            csv_name = os.path.join(tmp, 'ids.csv')
+            cli.main(['generate', '--seed-file', seed_file, '--host', '01', '--count', '2',
+                      '--format', 'csv', '--output', csv_name])
+            with open(csv_name) as f:
+                self.assertEqual(f.read(), 'id,seed\n101V,1\n201T,2\n')
+            with open(seed_file) as f:
+                self.assertEqual(f.read(), '2\n')
+            # the next run continues the series
+            json_name = os.path.join(tmp, 'ids.jsonl')
+            cli.main(['generate', '--seed-file', seed_file, '--host', '01', '--count', '1',
+                      '--format', 'jsonl', '--output', json_name,
+                      '--seedstore', RECORDER])
+            with open(json_name) as f:
+                self.assertEqual([json.loads(line) for line in f], [{'id': '301R', 'seed': '3'}])
+
+    def test_seedstore_called_once(self):
+        stored.clear()
+        with redirect_stdout(io.StringIO()):
+            cli.main(['generate', '--seed', '0', '--count', '25000', '--seedstore', RECORDER])
+        *_, last = cli.generate(IDstring(seed='0'), 25000)
+        self.assertEqual(stored, [last.get_seed()])
+
+    def test_batched_writes(self):
+        out = io.StringIO()
+        last = cli.write_ids(out, cli.generate(IDstring(seed='0'), 7), batch_size=3)
+        lines = out.getvalue().split()
+        self.assertEqual(len(lines), 7)
+        self.assertEqual(last, lines[-1])
+
+
+def ordinal(id_string):
+    """the integer value of the seed of an ID with default settings"""
+    return idstring.parse_ids([id_string], IDstring(seed='0'), as_int=True).seed[0]
+
+
+class FailingOutput(io.StringIO):
+    """an output file which raises `error` on its second write()"""
+    def __init__(self, error):
+        super().__init__()
+        self.error = error
+
+    def write(self, text):
+        if self.tell():
+            raise self.error
+        return super().write(text)
+
+
+class TestCutShort(unittest.TestCase):
+    # the seed must be preserved, once, at or past the last ID written, when a run stops partway
+    def run_cut_short(self, error, seed_file):
+        out = FailingOutput(error)
+        stored.clear()
+        with redirect_stdout(out), redirect_stderr(io.StringIO()):
+            status = cli.main(['generate', '--seed-file', seed_file, '--count', '30000', '--seedstore', RECORDER])
+        self.assertEqual(status, 1)
+        last_written = out.getvalue().split()[-1]
+        self.assertEqual(len(stored), 1)
+        self.assertGreaterEqual(ordinal(IDstring(seed=stored[0])), ordinal(last_written))
+        with open(seed_file) as f:
+            self.assertEqual(f.read(), stored[0] + '\n')
+        return last_written
+
+    def test_broken_pipe(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            seed_file = os.path.join(tmp, 'seed.txt')
+            with open(seed_file, 'w') as f:
+                f.write('0\n')
+            last_written = self.run_cut_short(BrokenPipeError(), seed_file)
+            # the next run must not repeat any ID
+            out = io.StringIO()
+            with redirect_stdout(out):
+                cli.main(['generate', '--seed-file', seed_file, '--count', '1'])
+            self.assertGreater(ordinal(out.getvalue().strip()), ordinal(last_written))
+
+    def test_disk_full(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            seed_file = os.path.join(tmp, 'seed.txt')
+            with open(seed_file, 'w') as f:
+                f.write('0\n')
+            self.run_cut_short(OSError(28, 'No space left on device'), seed_file)
+
+
+class TestErrors(unittest.TestCase):
+    def assertRejected(self, argv, message):
+        err = io.StringIO()
+        with redirect_stderr(err), redirect_stdout(io.StringIO()) as out:
+            with self.assertRaises(SystemExit) as cm:
+                cli.main(argv)
+        self.assertEqual(cm.exception.code, 2)
+        self.assertIn(message, err.getvalue())
+        self.assertEqual(out.getvalue(), '', 'no IDs should be written')
+
+    def test_empty_seed(self):
+        self.assertRejected(['generate', '--seed', '', '--count', '3'], 'seed must not be empty')
+
+    def test_seed_not_in_alphabet(self):
+        self.assertRejected(['generate', '--seed', '1I', '--count', '3'], '"I"')
+        self.assertRejected(['generate', '--seed', '12', '--alphabet', 'ABC', '--count', '3'], '"12"')
+
+    def test_host_not_in_alphabet(self):
+        self.assertRejected(['generate', '--seed', '0', '--host', 'O1', '--count', '3'], '--host')
+
+    def test_bad_seedstore(self):
+        self.assertRejected(['generate', '--seed', '0', '--count', '1', '--seedstore', 'nosuch:fn'], 'nosuch')
+        self.assertRejected(['generate', '--seed', '0', '--count', '1', '--seedstore', f'{__name__}:nosuch'],
+                            'nosuch')
+        self.assertRejected(['generate', '--seed', '0', '--count', '1', '--seedstore', 'json'], 'module:function')
+
+    def test_bad_output(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertRejected(['generate', '--seed', '0', '--count', '1',
+                                 '--output', os.path.join(tmp, 'no such directory', 'ids.txt')], 'cannot open output')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,8 @@ import idstring
 from idstring.idstring import IDstring, InvalidIdError
 import unittest
 import random
+import copy
+import pickle
 from contextlib import contextmanager
 
 dummy_seed = None  # Glabal variable used for ephemeral seed storage
@@ -255,5 +257,184 @@ class Test10(unittest.TestCase):
         assertion(f, 'aaaaa')
 
 
+class Serial(IDstring):  # a subclass for pickling tests
+    pass
+
+
+class Test11(unittest.TestCase):
+    # test pickling for transport between processes
+    def assertSmallPickle(self, many):
+        # after the first one, each IDstring should cost only a few bytes more than a plain str
+        overhead = len(pickle.dumps(many)) - len(pickle.dumps([str(i) for i in many]))
+        self.assertLess(overhead, 6 * len(many) + 200)
+
+    def test11a(self):
+        # an IDstring with default settings pickles almost as small as a plain str
+        x = IDstring(seed='1Y3R9C')
+        y = pickle.loads(pickle.dumps(x))
+        assertion(y, '1Y3R9CB')
+        self.assertEqual(y.seed, '1Y3R9C')
+        self.assertSmallPickle([IDstring(seed='%04d' % i) for i in range(1000)])
+
+    def test11a1(self):
+        # without a registered configuration, a picklable seedstore and context are kept, as they always were
+        x = IDstring(seed='1Y3R9C', host='01', hash='0', seedstore=dummy, context={'a': 1})
+        y = pickle.loads(pickle.dumps(x))
+        self.assertIs(type(y), IDstring)
+        self.assertIs(y.seedstore, dummy)
+        self.assertEqual(y.context, {'a': 1})
+        y += 1
+        assertion(y, IDstring(seed='1Y3R9D', host='01', hash='0'), '1Y3R9D')
+        y = pickle.loads(pickle.dumps(IDstring(seed='0', context={'a': 1})))
+        self.assertEqual(y.context, {'a': 1})
+        # but they must not be silently dropped if they cannot be pickled
+        self.assertRaises(idstring.IdStringError, pickle.dumps, IDstring(seed='0', seedstore=lambda i: None))
+
+    def test11a2(self):
+        # the settings are sent once per pickle, not once per IDstring
+        many = [IDstring(seed='%04d' % i, host='01', hash='ORD') for i in range(10000)]
+        self.assertSmallPickle(many)
+        self.assertEqual(pickle.loads(pickle.dumps(many)), many)
+
+    def test11b(self):
+        # settings other than seedstore and context survive the trip
+        x = IDstring(seed='AbC', host='ab', hash=None, alphabet='ABCabc', case_shift=None)
+        y = pickle.loads(pickle.dumps(x))
+        y += 1
+        assertion(y, 'Abaab')
+
+    def test11c(self):
+        # a registered configuration re-binds seedstore and context on unpickling
+        context = {'where': 'here'}
+        idstring.register_config('test11', host='01', hash='0', seedstore=dummy, context=context)
+        x = IDstring.from_config('test11', seed='90A')
+        self.assertSmallPickle([IDstring.from_config('test11', seed='%04d' % i) for i in range(1000)])
+        y = pickle.loads(pickle.dumps(x))
+        self.assertIs(y.context, context)
+        y += 1
+        assertion(y, IDstring(seed='90B', host='01', hash='0'), '90B')
+        self.assertEqual(y.config, 'test11')
+        self.assertRaises(idstring.IdStringError, IDstring.from_config, 'not registered', seed='0')
+
+    def test11d(self):
+        x = IDstring(seed='0', seedstore=dummy, context={'conn': object()})
+        y = copy.copy(x)
+        self.assertIs(y.seedstore, dummy)
+        self.assertIs(y.context, x.context)
+
+    def test11e(self):
+        x = IDstring(seed='0', seedstore=dummy, context={'a': [1]})
+        y = copy.deepcopy(x)
+        assertion(y, '00')
+        self.assertIs(y.seedstore, dummy)
+        self.assertEqual(y.context, x.context)
+        self.assertIsNot(y.context['a'], x.context['a'])
+        y += 1
+        assertion(y, '1X', '1')
+
+    def test11f(self):
+        # subclasses keep their type
+        x = Serial(seed='0', host='01')
+        self.assertIs(type(pickle.loads(pickle.dumps(x))), Serial)
+
+
+class Test12(unittest.TestCase):
+    # test the bulk field parser
+    def test12a(self):
+        ids = [IDstring(seed='1y', host='ab'), IDstring(seed='10', host='cd'), IDstring(seed='2', host='ab')]
+        fields = idstring.parse_ids(ids, IDstring(seed='0', host='ab'))
+        self.assertEqual(fields.seed, [i.seed for i in ids])
+        self.assertEqual(fields.host, ['AB', 'CD', 'AB'])
+        self.assertEqual(fields.check, [i[-1] for i in ids])
+        self.assertEqual(fields.by_host, {'AB': [0, 2], 'CD': [1]})
+
+    def test12b(self):
+        # integer seeds, from lower case strings, using a registered configuration
+        idstring.register_config('test12', host='01', hash='X')
+        ids = [str(IDstring.from_config('test12', seed=seed)).lower() for seed in ['0000', '0010', 'Y', '10000']]
+        fields = idstring.parse_ids(ids, 'test12', as_int=True)
+        self.assertEqual(fields.seed, [0, 32, 31, 32 ** 4])
+        self.assertEqual(fields.by_host, {'01': [0, 1, 2, 3]})
+
+    def test12c(self):
+        # no checksum, alphabet too long for int()
+        alphabet = ''.join(chr(c) for c in range(0x3b1, 0x3b1 + 40))
+        fields = idstring.parse_ids([alphabet[1] + alphabet[39]], IDstring(seed='', hash=None, alphabet=alphabet,
+                                                                             case_shift=None), as_int=True)
+        self.assertEqual(fields.seed, [79])
+        self.assertEqual(fields.check, [''])
+
+    def test12d(self):
+        example = IDstring(seed='0', host='ab')
+        self.assertRaises(InvalidIdError, idstring.parse_ids, ['AB0'], example)
+        self.assertRaises(InvalidIdError, idstring.parse_ids, ['IAB0'], example, as_int=True)
+
+
+class Test13(unittest.TestCase):
+    # test classification of IDs by hash
+    def test13a(self):
+        hashes = {'default': '', 'zero': '0', 'xx': 'XX', 'odd': 'ABC'}
+        classifier = idstring.HashClassifier(hashes)
+        self.assertEqual(classifier.classify('TESTME2K'), ['default'])
+        self.assertEqual(classifier.classify('testme29'), ['zero'])
+        self.assertEqual(classifier.classify(IDstring(seed='90A', host='1234', hash='ABC')), ['odd'])
+        self.assertEqual(classifier.classify_many(['', 'TESTMEI9']), [[], []])
+
+    def test13b(self):
+        # must agree with sumcheck() for every hash
+        alphabet = IDstring.ALPHABET
+        hashes = [''.join(random.choice(alphabet) for _ in range(random.randint(1, 4))) for _ in range(30)]
+        classifier = idstring.HashClassifier(hashes)
+        ids = [''.join(random.choice(alphabet) for _ in range(random.randint(1, 12))) for _ in range(500)]
+        ids += [IDstring(seed=i, hash=random.choice(hashes)) for i in ids]
+        for i, found in zip(ids, classifier.classify_many(ids)):
+            self.assertEqual(found, [h for h in dict.fromkeys(hashes) if IDstring.sumcheck(i, hash=h)])
+
+    def test13c(self):
+        self.assertRaises(idstring.IdStringError, idstring.HashClassifier, {'dumb': None})
+
+
+class Test14(unittest.TestCase):
+    # test auditing an issued series
+    def series(self, first, count):
+        ids = [first]
+        for _ in range(count):
+            ids.append(ids[-1] + 1)
+        return ids
+
+    def test14a(self):
+        # a complete series which skips dirty words has no gaps
+        first = IDstring(seed='AS00', host='01')
+        ids = self.series(first, 2000)
+        self.assertTrue(any(i.startswith('AST') for i in ids))
+        report = idstring.audit_ids(reversed(ids), first, ids[-1])
+        self.assertEqual(report, (2001, [], [], []))
+
+    def test14b(self):
+        first = IDstring(seed='AS00', host='01')
+        ids = self.series(first, 2000)
+        issued = ids[:100] + ids[103:] + [ids[7], ids[7]]
+        issued += [IDstring(seed='ASS1', host='01'), 'AS0001Y', IDstring(seed='AS00', host='02'), 'AS000',
+                   IDstring(seed='0AS00', host='01'), IDstring(seed='AS0', host='01'), ids[-1] + 1]
+        report = idstring.audit_ids(issued, first, str(ids[-1]).lower())
+        self.assertEqual(report.count, len(issued))
+        self.assertEqual(report.duplicates, [ids[7], ids[7]])
+        self.assertEqual(report.missing, ids[100:103])
+        self.assertEqual(report.out_of_series, issued[-7:])
+
+    def test14c(self):
+        # carry into a longer seed
+        first = IDstring(seed='YY', hash='0')
+        ids = self.series(first, 40)
+        report = idstring.audit_ids(ids[:-1], first, ids[-1])
+        self.assertEqual(report.missing, [ids[-1]])
+        self.assertRaises(idstring.OutOfRangeError, idstring.audit_ids, [], ids[1], ids[0])
+
+    def test14d(self):
+        # without a checksum the factory does not skip dirty words correctly, so it cannot be audited
+        first = IDstring(seed='ASRY', hash=None)
+        self.assertRaises(idstring.IdStringError, idstring.audit_ids, [first], first, first)
+
+
 if __name__ == "__main__":
     unittest.main()